@@ -1,13 +1,66 @@
-from randevu import connect_db, create_tables
+from randevu import fetch_appointment_row, notify_change
+from sifreleme import DogrulamaHavuzu, dogrula_ve_guncelle, sahte_dogrulama, sifre_hashle
 import sqlite3
+import threading
+
+DATABASE_NAME = 'kuafor_randevu.db'
+
+# Giriş yoğunluğunda doğrulamaların diğer işleri bekletmemesi için ortak havuz
+_dogrulama_havuzu = None
+_dogrulama_havuzu_kilidi = threading.Lock()
+
+def connect_db():
+    """Veritabanına bağlanır, bağlantı ve cursor nesnelerini döndürür."""
+    conn = sqlite3.connect(DATABASE_NAME)
+    conn.row_factory = sqlite3.Row
+    return conn, conn.cursor()
+
+def create_tables():
+    """Müşteri, kuaför, hizmet ve randevu tablolarını oluşturur."""
+    conn, cursor = connect_db()
+    cursor.executescript('''
+        CREATE TABLE IF NOT EXISTS musteriler (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kullanici_adi TEXT NOT NULL UNIQUE,
+            sifre TEXT NOT NULL,
+            eposta TEXT,
+            telefon TEXT
+        );
+        CREATE TABLE IF NOT EXISTS kuaforler (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ad_soyad TEXT NOT NULL,
+            uzmanlik_alani TEXT
+        );
+        CREATE TABLE IF NOT EXISTS hizmetler (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            hizmet_adi TEXT NOT NULL UNIQUE,
+            fiyat REAL NOT NULL,
+            tahmini_sure_dk INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS randevular (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            musteri_id INTEGER NOT NULL,
+            kuafor_id INTEGER NOT NULL,
+            hizmet_id INTEGER NOT NULL,
+            randevu_tarihi TEXT NOT NULL,
+            randevu_saati TEXT NOT NULL,
+            durum TEXT DEFAULT 'Onaylandı',
+            FOREIGN KEY (musteri_id) REFERENCES musteriler(id),
+            FOREIGN KEY (kuafor_id) REFERENCES kuaforler(id),
+            FOREIGN KEY (hizmet_id) REFERENCES hizmetler(id)
+        );
+    ''')
+    conn.commit()
+    conn.close()
 
 def musteri_ekle(kullanici_adi, sifre, eposta=None, telefon=None):
+    sifre_hash = sifre_hashle(sifre)
     conn, cursor = connect_db()
     try:
         cursor.execute('''
             INSERT INTO musteriler (kullanici_adi, sifre, eposta, telefon)
             VALUES (?, ?, ?, ?)
-        ''', (kullanici_adi, sifre, eposta, telefon))
+        ''', (kullanici_adi, sifre_hash, eposta, telefon))
         conn.commit()
         print(f"Müşteri '{kullanici_adi}' başarıyla eklendi.")
     except sqlite3.IntegrityError:
@@ -15,6 +68,50 @@ def musteri_ekle(kullanici_adi, sifre, eposta=None, telefon=None):
     finally:
         conn.close()
 
+def _sifre_kaydi_getir(kullanici_adi):
+    conn, cursor = connect_db()
+    try:
+        cursor.execute('SELECT id, sifre FROM musteriler WHERE kullanici_adi = ?', (kullanici_adi,))
+        return cursor.fetchone()
+    finally:
+        conn.close()
+
+def _sifre_guncelle(musteri_id, eski_hash, yeni_hash):
+    conn, cursor = connect_db()
+    try:
+        # Aynı anda başka bir giriş hash'i değiştirdiyse üzerine yazma
+        cursor.execute('UPDATE musteriler SET sifre = ? WHERE id = ? AND sifre = ?',
+                       (yeni_hash, musteri_id, eski_hash))
+        conn.commit()
+    finally:
+        conn.close()
+
+def musteri_giris(kullanici_adi, sifre):
+    """Müşteri bilgileri doğruysa müşteri ID'sini, değilse None döndürür.
+
+    Şifre eski ayarlarla (veya düz metin) saklanmışsa güncel ayarlarla yeniden hash'lenir.
+    """
+    kayit = _sifre_kaydi_getir(kullanici_adi)
+    if kayit is None:
+        # Kullanıcı adının var olup olmadığı yanıt süresinden anlaşılmasın
+        sahte_dogrulama(sifre)
+        return None
+    musteri_id, saklanan = kayit[0], kayit[1]
+    dogru_mu, yeni_hash = dogrula_ve_guncelle(sifre, saklanan)
+    if not dogru_mu:
+        return None
+    if yeni_hash:
+        _sifre_guncelle(musteri_id, saklanan, yeni_hash)
+    return musteri_id
+
+def musteri_giris_async(kullanici_adi, sifre):
+    """musteri_giris'i arka plan havuzunda çalıştırır ve bir Future döndürür."""
+    global _dogrulama_havuzu
+    with _dogrulama_havuzu_kilidi:
+        if _dogrulama_havuzu is None:
+            _dogrulama_havuzu = DogrulamaHavuzu()
+    return _dogrulama_havuzu.calistir(musteri_giris, kullanici_adi, sifre)
+
 def kuafor_ekle(ad_soyad, uzmanlik_alani):
     conn, cursor = connect_db()
     try:
@@ -50,7 +147,10 @@ def randevu_olustur(musteri_id, kuafor_id, hizmet_id, tarih, saat):
             INSERT INTO randevular (musteri_id, kuafor_id, hizmet_id, randevu_tarihi, randevu_saati)
             VALUES (?, ?, ?, ?, ?)
         ''', (musteri_id, kuafor_id, hizmet_id, tarih, saat))
+        randevu_id = cursor.lastrowid
+        sonraki = fetch_appointment_row(cursor, randevu_id)
         conn.commit()
+        notify_change(DATABASE_NAME, 'insert', randevu_id, None, sonraki)
         print(f"Randevu başarıyla oluşturuldu: Müşteri ID: {musteri_id}, Kuaför ID: {kuafor_id}, Tarih: {tarih} {saat}")
     except Exception as e:
         print(f"Randevu oluşturulurken bir hata oluştu: {e}")
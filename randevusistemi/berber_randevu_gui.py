@@ -6,6 +6,12 @@ from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                                QTableWidget, QTableWidgetItem, QHeaderView)
 from PySide6.QtCore import Qt
 
+# Yazma işlemleri randevu.py üzerinden yapılır; böylece değişiklik dinleyicileri
+# (hatırlatıcı, değişiklik günlüğü) GUI'den yapılan değişiklikleri de görür.
+from randevu import (add_appointment, update_appointment, delete_appointment, add_change_listener,
+                     start_journal, REMINDER_OUTBOX, SENT_REMINDERS_FILE)
+from hatirlatici import DosyaGonderici, HatirlaticiZamanlayici
+
 # --- Mevcut Veritabanı Fonksiyonlarınız ---
 DATABASE_NAME = 'berber_randevu.db'
 
@@ -43,23 +49,6 @@ def convert_date_from_db_format(date_str):
     except ValueError:
         return None
 
-def add_appointment(musteri_adi, tarih_gg_aa_yyyy, saat, berber_adi=None):
-    tarih_db_format = convert_date_to_db_format(tarih_gg_aa_yyyy)
-    if not tarih_db_format:
-        return "Hata: Geçersiz tarih formatı. Lütfen GG-AA-YYYY formatında girin."
-
-    conn = connect_db()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("INSERT INTO randevular (musteri_adi, tarih, saat, berber_adi) VALUES (?, ?, ?, ?)",
-                       (musteri_adi, tarih_db_format, saat, berber_adi))
-        conn.commit()
-        return f"{musteri_adi} için {tarih_gg_aa_yyyy} {saat} tarihine randevu başarıyla eklendi."
-    except sqlite3.Error as e:
-        return f"Randevu eklenirken bir hata oluştu: {e}"
-    finally:
-        conn.close()
-
 def get_all_appointments():
     conn = connect_db()
     cursor = conn.cursor()
@@ -90,66 +79,6 @@ def get_appointments_by_date(tarih_gg_aa_yyyy):
         formatted_appointments.append((app[0], app[1], formatted_date, app[3], app[4]))
     return None, formatted_appointments
 
-def update_appointment(appointment_id, new_musteri_adi=None, new_tarih_gg_aa_yyyy=None, new_saat=None, new_berber_adi=None):
-    conn = connect_db()
-    cursor = conn.cursor()
-    update_fields = []
-    update_values = []
-
-    if new_musteri_adi:
-        update_fields.append("musteri_adi = ?")
-        update_values.append(new_musteri_adi)
-    
-    if new_tarih_gg_aa_yyyy:
-        new_tarih_db_format = convert_date_to_db_format(new_tarih_gg_aa_yyyy)
-        if not new_tarih_db_format:
-            conn.close()
-            return "Hata: Güncellenecek tarih için geçersiz format. Lütfen GG-AA-YYYY formatında girin."
-        update_fields.append("tarih = ?")
-        update_values.append(new_tarih_db_format)
-    
-    if new_saat:
-        update_fields.append("saat = ?")
-        update_values.append(new_saat)
-    if new_berber_adi:
-        update_fields.append("berber_adi = ?")
-        update_values.append(new_berber_adi)
-
-    if not update_fields:
-        conn.close()
-        return "Güncellenecek alan bulunamadı."
-
-    update_query = f"UPDATE randevular SET {', '.join(update_fields)} WHERE id = ?"
-    update_values.append(appointment_id)
-
-    try:
-        cursor.execute(update_query, tuple(update_values))
-        conn.commit()
-        if cursor.rowcount > 0:
-            return f"Randevu ID {appointment_id} başarıyla güncellendi."
-        else:
-            return f"Randevu ID {appointment_id} bulunamadı."
-    except sqlite3.Error as e:
-        return f"Randevu güncellenirken bir hata oluştu: {e}"
-    finally:
-        conn.close()
-
-# delete_appointment fonksiyonu geri eklendi
-def delete_appointment(appointment_id):
-    conn = connect_db()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("DELETE FROM randevular WHERE id = ?", (appointment_id,))
-        conn.commit()
-        if cursor.rowcount > 0:
-            return f"Randevu ID {appointment_id} başarıyla silindi."
-        else:
-            return f"Randevu ID {appointment_id} bulunamadı."
-    except sqlite3.Error as e:
-        return f"Randevu silinirken bir hata oluştu: {e}"
-    finally:
-        conn.close()
-
 # --- PySide6 GUI Sınıfı ---
 class BarberAppointmentApp(QMainWindow):
     def __init__(self):
@@ -390,7 +319,14 @@ class BarberAppointmentApp(QMainWindow):
 
 if __name__ == "__main__":
     create_table()  # Uygulama her başladığında tabloyu oluştur
+    start_journal()
+    reminders = HatirlaticiZamanlayici(DosyaGonderici(REMINDER_OUTBOX), DATABASE_NAME,
+                                       gonderilenler_dosyasi=SENT_REMINDERS_FILE)
+    add_change_listener(reminders.randevu_degisti)
+    reminders.baslat()
     app = QApplication(sys.argv)
     window = BarberAppointmentApp()
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    exit_code = app.exec()
+    reminders.durdur()
+    sys.exit(exit_code)
\ No newline at end of file
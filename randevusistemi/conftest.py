@@ -0,0 +1,12 @@
+import pytest
+
+import randevu
+
+
+@pytest.fixture
+def veritabani(tmp_path, monkeypatch):
+    yol = str(tmp_path / 'berber.db')
+    monkeypatch.setattr(randevu, 'DATABASE_NAME', yol)
+    monkeypatch.setattr(randevu, '_change_listeners', [])
+    randevu.create_table()
+    return yol
@@ -0,0 +1,379 @@
+import argparse
+import atexit
+import glob
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows: günlük dizini kilitlenmez
+    fcntl = None
+
+# Dizin düzeni:
+#   gunluk.jsonl                 Her satır bir değişiklik:
+#                                {"seq":..,"ts":..,"islem":..,"id":..,"onceki":{..},"sonraki":{..}}
+#   checkpoint-000000001234-20261019T093000.123456Z.json
+#                                seq 1234'e kadar olan tablonun tam hali ve
+#                                gunluk.jsonl içinde sonraki kaydın bayt konumu.
+#                                Checkpoint'in ts değeri dosya adında da bulunur;
+#                                böylece geri yüklemede yalnızca seçilen checkpoint okunur.
+# ts UTC ve ISO 8601 biçimindedir, bu yüzden metin olarak karşılaştırılabilir.
+# Sistem saati geri alınsa bile günlükteki ts değerleri azalmaz (bkz. _zaman_damgasi).
+
+GUNLUK_DOSYASI = 'gunluk.jsonl'
+TABLO = 'randevular'
+
+logger = logging.getLogger('degisiklik_gunlugu')
+
+
+class GunlukKullanimdaHatasi(RuntimeError):
+    """Günlük dizini başka bir süreç tarafından kullanılıyor."""
+
+
+def _simdi():
+    return datetime.now(timezone.utc).isoformat(timespec='microseconds')
+
+
+def _zaman_metni(zaman):
+    """datetime ya da 'YYYY-MM-DD HH:MM[:SS]' metnini günlükteki ts biçimine çevirir.
+
+    Saat dilimi belirtilmemiş zamanlar yerel saat kabul edilir.
+    """
+    if isinstance(zaman, str):
+        zaman = datetime.fromisoformat(zaman)
+    return zaman.astimezone(timezone.utc).isoformat(timespec='microseconds')
+
+
+def _checkpointler(dizin):
+    """Dizindeki checkpoint dosyalarını seq sırasına göre döndürür."""
+    return sorted(glob.glob(os.path.join(dizin, 'checkpoint-*.json')))
+
+
+def _checkpoint_adi(seq, ts):
+    zaman = datetime.fromisoformat(ts).astimezone(timezone.utc)
+    return f"checkpoint-{seq:012d}-{zaman.strftime('%Y%m%dT%H%M%S.%fZ')}.json"
+
+
+def _checkpoint_zamani(yol):
+    """Checkpoint'in ts değerini dosya adından okur; adında zaman yoksa dosyayı yükler."""
+    parcalar = os.path.basename(yol)[:-len('.json')].split('-')
+    if len(parcalar) == 3:
+        zaman = datetime.strptime(parcalar[2], '%Y%m%dT%H%M%S.%fZ').replace(tzinfo=timezone.utc)
+        return zaman.isoformat(timespec='microseconds')
+    return _checkpoint_oku(yol)['ts']
+
+
+def _checkpoint_oku(yol):
+    with open(yol, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _uygula(satirlar, kayit):
+    if kayit['islem'] == 'delete':
+        satirlar.pop(kayit['id'], None)
+    else:
+        satirlar[kayit['id']] = kayit['sonraki']
+
+
+def durumu_olustur(dizin, zaman=None):
+    """Tablonun verilen zamandaki halini {id: satır} olarak yeniden kurar.
+
+    zaman verilmezse günlükteki son durum döner. Zamandan önceki en son
+    checkpoint yüklenir ve günlük o checkpoint'in bayt konumundan itibaren
+    okunduğu için yalnızca son checkpoint'ten sonraki kayıtlar işlenir.
+    Sonuç (satirlar, checkpoint) ikilisidir; checkpoint kullanılan checkpoint'tir.
+    """
+    hedef = _zaman_metni(zaman) if zaman is not None else None
+
+    checkpoint = None
+    for yol in reversed(_checkpointler(dizin)):
+        if hedef is None or _checkpoint_zamani(yol) <= hedef:
+            checkpoint = _checkpoint_oku(yol)
+            break
+    if checkpoint is None:
+        raise ValueError(f"{dizin} içinde bu zamandan önce alınmış bir checkpoint yok.")
+
+    satirlar = {satir['id']: satir for satir in checkpoint['satirlar']}
+    gunluk_yolu = os.path.join(dizin, GUNLUK_DOSYASI)
+    if not os.path.exists(gunluk_yolu):
+        return satirlar, checkpoint
+
+    with open(gunluk_yolu, 'rb') as f:
+        f.seek(checkpoint['gunluk_konumu'])
+        for satir in f:
+            if not satir.endswith(b'\n'):
+                break  # Yarım yazılmış son kayıt
+            kayit = json.loads(satir)
+            if hedef is not None and kayit['ts'] > hedef:
+                break
+            _uygula(satirlar, kayit)
+    return satirlar, checkpoint
+
+
+def geri_yukle(dizin, zaman, hedef_veritabani):
+    """Tablonun verilen zamandaki halini yeni bir veritabanı dosyasına yazar.
+
+    Yazılan randevu sayısını döndürür.
+    """
+    satirlar, checkpoint = durumu_olustur(dizin, zaman)
+    if os.path.exists(hedef_veritabani):
+        raise FileExistsError(f"Hedef veritabanı zaten mevcut: {hedef_veritabani}")
+
+    conn = sqlite3.connect(hedef_veritabani)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(checkpoint['sema'])
+        sutunlar = checkpoint['sutunlar']
+        cursor.executemany(
+            f"INSERT INTO {TABLO} ({', '.join(sutunlar)}) VALUES ({', '.join('?' * len(sutunlar))})",
+            [tuple(satir.get(sutun) for sutun in sutunlar) for satir in satirlar.values()])
+        conn.commit()
+    finally:
+        conn.close()
+    return len(satirlar)
+
+
+class DegisiklikGunlugu:
+    """Randevu değişikliklerini önceki ve sonraki halleriyle kaydeden, yalnızca ekleme yapılan günlük.
+
+    kaydet metodu randevu.add_change_listener ile kaydedilir. Kayıtlar
+    bellekte toplanır; `toplu_boyut` kayda ulaşıldığında ya da ilk bekleyen
+    kayıt `bekleme_suresi` saniyeyi geçtiğinde (ayrıca bosalt çağrıldığında ve
+    program kapanırken) diske yazılıp fsync edilir. Etkileşimli kullanımda
+    toplu_boyut=1 verilerek her değişiklik commit'ten hemen sonra diske yazılır.
+    Her `checkpoint_araligi` kayıtta bir tablonun tam hali checkpoint olarak
+    yazılır; böylece geri yükleme yalnızca son checkpoint'ten sonrasını okur.
+
+    Checkpoint'ler günlükten türetilir. Açılışta günlükteki durum
+    veritabanıyla karşılaştırılır; dinleyiciden geçmeden yapılmış (ör. başka
+    bir araçla ya da günlüğe yazılamadan çöken bir süreçte) değişiklikler
+    'mutabakat' kaynaklı kayıtlar olarak günlüğe eklenir ve uyarı loglanır.
+
+    Bir dizini aynı anda yalnızca bir süreç kullanabilir; ikinci süreç
+    GunlukKullanimdaHatasi alır. `veritabani` dışındaki veritabanlarından
+    gelen bildirimler (ör. app.py'nin randevuları) günlüğe yazılmaz.
+
+    Sınırlama: randevu.notify_change commit'ten sonra çağrıldığı için günlük
+    gerçek anlamda önceden yazılan (write-ahead) bir günlük değildir. Commit
+    ile günlüğe yazma arasında çöken bir sürecin değişikliği kaybolmaz, bir
+    sonraki açılışta mutabakat kaydı olarak eklenir; ancak bu kaydın ts değeri
+    değişikliğin değil onarımın zamanıdır. Bu yüzden o aralıktaki bir zamana
+    geri yükleme, değişikliği olduğundan daha geç uygulanmış gösterir.
+    """
+
+    def __init__(self, dizin, veritabani, toplu_boyut=100, checkpoint_araligi=10000,
+                 bekleme_suresi=0.2):
+        self.dizin = dizin
+        self.veritabani = veritabani
+        self._veritabani_yolu = os.path.realpath(veritabani)
+        self.toplu_boyut = toplu_boyut
+        self.checkpoint_araligi = checkpoint_araligi
+        self.bekleme_suresi = bekleme_suresi
+        self._gunluk_yolu = os.path.join(dizin, GUNLUK_DOSYASI)
+        self._tampon = []
+        self._bosaltma_zamanlayicisi = None
+        self._son_ts = ''
+        self._kilit = threading.Lock()
+
+        os.makedirs(dizin, exist_ok=True)
+        self._kilit_dosyasi = self._dizini_kilitle()
+        if self._kurtarilabilir_mi():
+            self._kurtar()
+            self._dosya = open(self._gunluk_yolu, 'ab')
+            self._veritabaniyla_esitle()
+        else:
+            self._baslangic_checkpoint()
+            self._dosya = open(self._gunluk_yolu, 'ab')
+        atexit.register(self.kapat)
+
+    def _dizini_kilitle(self):
+        kilit_dosyasi = open(os.path.join(self.dizin, 'kilit'), 'w')
+        if fcntl is not None:
+            try:
+                fcntl.flock(kilit_dosyasi, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                kilit_dosyasi.close()
+                raise GunlukKullanimdaHatasi(f"{self.dizin} başka bir süreç tarafından kullanılıyor.")
+        return kilit_dosyasi
+
+    def _kurtarilabilir_mi(self):
+        """Checkpoint'ler ve onlara uyan bir günlük dosyası varsa True döndürür.
+
+        Checkpoint'ler olduğu halde günlük kayıpsa ya da son checkpoint'in
+        gösterdiği konumdan kısaysa eski checkpoint'ler kenara alınır ve
+        veritabanından yeni bir başlangıç yapılır.
+        """
+        checkpointler = _checkpointler(self.dizin)
+        if not checkpointler:
+            return False
+        son_konum = _checkpoint_oku(checkpointler[-1])['gunluk_konumu']
+        if os.path.exists(self._gunluk_yolu) and os.path.getsize(self._gunluk_yolu) >= son_konum:
+            return True
+
+        logger.warning("%s içindeki günlük dosyası kayıp ya da eksik; veritabanından yeni bir "
+                       "başlangıç checkpoint'i alınıyor, eski checkpoint'ler .eski uzantısıyla saklanıyor.",
+                       self.dizin)
+        for yol in checkpointler:
+            os.replace(yol, yol + '.eski')
+        return False
+
+    def _veritabani_durumu(self):
+        """Veritabanındaki tablonun şemasını, sütunlarını ve {id: satır} halini döndürür."""
+        conn = sqlite3.connect(self.veritabani)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (TABLO,))
+            sema = cursor.fetchone()
+            if sema is None:
+                raise ValueError(f"{self.veritabani} içinde {TABLO} tablosu bulunamadı.")
+            sutunlar = [satir[1] for satir in cursor.execute(f"PRAGMA table_info({TABLO})")]
+            satirlar = {satir['id']: dict(satir) for satir in cursor.execute(f"SELECT * FROM {TABLO}")}
+        finally:
+            conn.close()
+        return sema[0], sutunlar, satirlar
+
+    def _baslangic_checkpoint(self):
+        self._sema, self._sutunlar, self._satirlar = self._veritabani_durumu()
+        self._seq = 0
+        self._son_checkpoint_seq = 0
+        # Önceki bir denemeden kalmış, checkpoint'i olmayan günlük kullanılamaz
+        open(self._gunluk_yolu, 'wb').close()
+        self._checkpoint_yaz(0)
+
+    def _kurtar(self):
+        """Son checkpoint ve sonrasındaki günlükten durumu yükler, yarım kalmış son satırı atar."""
+        self._satirlar, checkpoint = durumu_olustur(self.dizin)
+        self._sema = checkpoint['sema']
+        self._sutunlar = checkpoint['sutunlar']
+        self._seq = self._son_checkpoint_seq = checkpoint['seq']
+        self._son_ts = checkpoint['ts']
+
+        with open(self._gunluk_yolu, 'rb+') as f:
+            f.seek(checkpoint['gunluk_konumu'])
+            konum = f.tell()
+            for satir in f:
+                if not satir.endswith(b'\n'):
+                    break
+                kayit = json.loads(satir)
+                self._seq = kayit['seq']
+                self._son_ts = max(self._son_ts, kayit['ts'])
+                konum += len(satir)
+            f.truncate(konum)
+
+    def _veritabaniyla_esitle(self):
+        """Günlükteki durumla veritabanı arasındaki farkları 'mutabakat' kayıtları olarak yazar."""
+        _, _, veritabani_satirlari = self._veritabani_durumu()
+        farklar = []
+        with self._kilit:
+            for randevu_id in sorted(self._satirlar.keys() | veritabani_satirlari.keys()):
+                onceki = self._satirlar.get(randevu_id)
+                sonraki = veritabani_satirlari.get(randevu_id)
+                if onceki == sonraki:
+                    continue
+                islem = 'insert' if onceki is None else 'delete' if sonraki is None else 'update'
+                self._kayit_ekle(islem, randevu_id, onceki, sonraki, kaynak='mutabakat')
+                farklar.append(randevu_id)
+            self._bosalt()
+        if farklar:
+            logger.warning("Günlüğe yazılmamış %d randevu değişikliği veritabanında bulundu ve "
+                           "günlüğe eklendi (ID: %s).", len(farklar), ', '.join(map(str, farklar)))
+
+    def _zaman_damgasi(self):
+        # Sistem saati geri alınırsa son değeri koru; böylece ts hiç azalmaz ve
+        # geri yükleme ilk büyük ts değerinde güvenle durabilir.
+        self._son_ts = max(_simdi(), self._son_ts)
+        return self._son_ts
+
+    def _kayit_ekle(self, islem, appointment_id, onceki, sonraki, **ek):
+        self._seq += 1
+        kayit = {'seq': self._seq, 'ts': self._zaman_damgasi(), 'islem': islem, 'id': appointment_id,
+                 'onceki': onceki, 'sonraki': sonraki, **ek}
+        self._tampon.append(json.dumps(kayit, ensure_ascii=False, separators=(',', ':')))
+        _uygula(self._satirlar, kayit)
+
+        if len(self._tampon) >= self.toplu_boyut:
+            self._bosalt()
+        elif len(self._tampon) == 1 and self.bekleme_suresi is not None:
+            self._bosaltma_zamanlayicisi = threading.Timer(self.bekleme_suresi, self.bosalt)
+            self._bosaltma_zamanlayicisi.daemon = True
+            self._bosaltma_zamanlayicisi.start()
+        if self._seq - self._son_checkpoint_seq >= self.checkpoint_araligi:
+            self._bosalt()
+            self._checkpoint_yaz(self._dosya.tell())
+            self._son_checkpoint_seq = self._seq
+
+    def kaydet(self, veritabani, islem, appointment_id, onceki=None, sonraki=None):
+        """Değişikliği günlüğe ekler. randevu.add_change_listener imzasıyla uyumludur.
+
+        Başka bir veritabanındaki değişiklikler yok sayılır; id'ler çakışabildiği
+        için günlükteki durumu bozarlar.
+        """
+        if os.path.realpath(veritabani) != self._veritabani_yolu:
+            return
+        with self._kilit:
+            self._kayit_ekle(islem, appointment_id, onceki, sonraki)
+
+    def bosalt(self):
+        """Bekleyen kayıtları diske yazar."""
+        with self._kilit:
+            self._bosalt()
+
+    def _bosalt(self):
+        if self._bosaltma_zamanlayicisi is not None:
+            self._bosaltma_zamanlayicisi.cancel()
+            self._bosaltma_zamanlayicisi = None
+        if not self._tampon or self._dosya.closed:
+            return
+        self._dosya.write(('\n'.join(self._tampon) + '\n').encode('utf-8'))
+        self._dosya.flush()
+        os.fsync(self._dosya.fileno())
+        self._tampon.clear()
+
+    def _checkpoint_yaz(self, gunluk_konumu):
+        ts = self._zaman_damgasi()
+        checkpoint = {
+            'seq': self._seq,
+            'ts': ts,
+            'gunluk_konumu': gunluk_konumu,
+            'sema': self._sema,
+            'sutunlar': self._sutunlar,
+            'satirlar': list(self._satirlar.values()),
+        }
+        yol = os.path.join(self.dizin, _checkpoint_adi(self._seq, ts))
+        gecici_yol = yol + '.tmp'
+        with open(gecici_yol, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, ensure_ascii=False, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(gecici_yol, yol)
+
+    def kapat(self):
+        with self._kilit:
+            if self._dosya.closed:
+                return
+            self._bosalt()
+            self._dosya.close()
+            self._kilit_dosyasi.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Randevular tablosunu günlükten belirli bir zamandaki haline geri yükler.")
+    parser.add_argument('dizin', help="Günlük dizini")
+    parser.add_argument('zaman', help="Geri yüklenecek zaman (YYYY-MM-DD HH:MM[:SS])")
+    parser.add_argument('hedef', help="Oluşturulacak yeni veritabanı dosyası")
+    args = parser.parse_args()
+
+    try:
+        sayi = geri_yukle(args.dizin, args.zaman, args.hedef)
+        print(f"{args.zaman} itibarıyla {sayi} randevu '{args.hedef}' dosyasına geri yüklendi.")
+    except (ValueError, FileExistsError, sqlite3.Error) as e:
+        print(f"Hata: {e}")
+
+
+if __name__ == '__main__':
+    main()
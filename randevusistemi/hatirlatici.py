@@ -0,0 +1,357 @@
+import heapq
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+logger = logging.getLogger('hatirlatici')
+
+# Bu durumlardaki randevular için hatırlatma gönderilmez (app.py şemasındaki durum sütunu)
+HATIRLATILMAYAN_DURUMLAR = {'İptal', 'İptal Edildi', 'Tamamlandı'}
+
+# Arka plan döngüsünde hata olduğunda tekrar denemeden önce beklenecek süre (sn)
+HATA_BEKLEMESI_MIN = 1
+HATA_BEKLEMESI_MAX = 300
+
+# Gönderilemeyen hatırlatmanın yeniden denenmesinden önce beklenecek süre
+GONDERIM_TEKRAR_SURESI = timedelta(minutes=1)
+
+
+def randevu_zamani(kayit):
+    """Her iki şemadaki randevu satırından randevu zamanını datetime olarak döndürür.
+
+    randevu.py şemasında tarih/saat, app.py şemasında randevu_tarihi/randevu_saati
+    sütunları kullanılır. Tarih YYYY-MM-DD, saat HH:MM biçimindedir.
+    Hatırlatılmayacak (iptal edilmiş vb.) ya da tarihi okunamayan satırlar için None döner.
+    """
+    if kayit.get('durum') in HATIRLATILMAYAN_DURUMLAR:
+        return None
+    tarih = kayit.get('tarih') or kayit.get('randevu_tarihi')
+    saat = kayit.get('saat') or kayit.get('randevu_saati')
+    try:
+        return datetime.strptime(f"{tarih} {saat}", '%Y-%m-%d %H:%M')
+    except (TypeError, ValueError):
+        return None
+
+
+class DosyaGonderici:
+    """Hatırlatmaları bir dosyaya satır satır JSON olarak yazar (testler ve yerel kullanım için)."""
+
+    def __init__(self, dosya_yolu):
+        self.dosya_yolu = dosya_yolu
+
+    def gonder(self, hatirlatma):
+        with open(self.dosya_yolu, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(hatirlatma, ensure_ascii=False) + '\n')
+
+
+class LogGonderici:
+    """Hatırlatmaları logging üzerinden yazar."""
+
+    def __init__(self, logger=None):
+        self.logger = logger or logging.getLogger('hatirlatici')
+
+    def gonder(self, hatirlatma):
+        self.logger.info("Hatırlatma: randevu %s, %s, müşteri %s",
+                         hatirlatma['randevu_id'], hatirlatma['randevu_zamani'], hatirlatma['musteri'])
+
+
+class HatirlaticiZamanlayici:
+    """Yaklaşan randevular için hatırlatmaları zamanı gelince gönderir.
+
+    Yalnızca önümüzdeki `pencere` süresi içinde gönderilecek hatırlatmalar bir
+    heap'te tutulur; pencere ilerledikçe sonraki dilim veritabanından tarih
+    aralığıyla okunur. randevu_degisti metodu randevu.add_change_listener ile
+    kaydedildiğinde aynı süreçteki ekleme, güncelleme ve silme işlemleri
+    anında yansıtılır, tablonun tamamı periyodik olarak taranmaz.
+
+    Değişiklik bildirimleri yalnızca aynı süreç içinde çalışır. Başka bir
+    süreçte (ör. ayrı çalışan GUI ya da CLI) yapılan değişiklikler için iki
+    önlem vardır: gönderimden hemen önce randevu veritabanından yeniden okunur,
+    silinmiş ya da saati değişmiş randevular için eski hatırlatma gönderilmez;
+    ayrıca yalnızca yüklenmiş pencere her `yeniden_tarama` süresinde bir
+    yeniden okunur, böylece başka süreçte eklenen randevular da en geç bu süre
+    sonunda sıraya girer.
+
+    gonderilenler_dosyasi verilirse gönderilen hatırlatmalar bu dosyada
+    saklanır ve yeniden başlatmada aynı hatırlatma tekrar gönderilmez.
+
+    Gönderici, gonder(hatirlatma) metodu olan herhangi bir nesne olabilir.
+    """
+
+    def __init__(self, gonderici, veritabani, onceden=timedelta(hours=1),
+                 pencere=timedelta(hours=6), yeniden_tarama=timedelta(minutes=5),
+                 gonderilenler_dosyasi=None, saat=datetime.now):
+        self.gonderici = gonderici
+        self.veritabani = veritabani
+        self._veritabani_yolu = os.path.realpath(veritabani)
+        self.onceden = onceden
+        self.pencere = pencere
+        self.yeniden_tarama = yeniden_tarama
+        self.gonderilenler_dosyasi = gonderilenler_dosyasi
+        self._saat = saat
+
+        self._heap = []  # (hatirlatma_zamani, sira, randevu_id)
+        self._sira = itertools.count()
+        self._gecerli_siralar = {}  # randevu_id -> heap'teki geçerli kaydın sıra numarası
+        self._kayitlar = {}  # randevu_id -> randevu satırı
+        # randevu_id -> hatırlatması gönderilmiş randevu zamanı. Veritabanından
+        # okuma ile değişiklik bildirimi yarışırsa ya da süreç yeniden
+        # başlatılırsa aynı hatırlatmanın iki kez gönderilmesini önler;
+        # randevu zamanı geçince silinir.
+        self._gonderilenler = self._gonderilenleri_oku()
+        self._yuklenen_ust = None  # Bu zamandan önceki randevular heap'e yüklendi
+        self._son_tarama = None
+        self._kilit = threading.RLock()
+        self._uyandir = threading.Event()
+        self._durdur = threading.Event()
+        self._thread = None
+
+    # --- Veritabanından yükleme ---
+
+    def _sorgula(self, sorgu_olustur, parametreler):
+        conn = sqlite3.connect(self.veritabani)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.cursor()
+            sutunlar = {satir[1] for satir in cursor.execute("PRAGMA table_info(randevular)")}
+            if not sutunlar:
+                raise sqlite3.OperationalError(f"{self.veritabani} içinde randevular tablosu yok")
+            cursor.execute(sorgu_olustur(sutunlar), parametreler)
+            return [dict(satir) for satir in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def _satirlari_getir(self, randevu_idleri):
+        """Verilen randevuların veritabanındaki güncel hallerini {id: satır} olarak döndürür."""
+        if not randevu_idleri:
+            return {}
+        yer_tutucular = ', '.join('?' * len(randevu_idleri))
+        satirlar = self._sorgula(lambda sutunlar: f"SELECT * FROM randevular WHERE id IN ({yer_tutucular})",
+                                 tuple(randevu_idleri))
+        return {satir['id']: satir for satir in satirlar}
+
+    def _satirlari_oku(self, alt, ust):
+        """Randevu zamanı (alt, ust] aralığında olan satırları okur."""
+        def sorgu(sutunlar):
+            tarih_sutunu = 'tarih' if 'tarih' in sutunlar else 'randevu_tarihi'
+            return f"SELECT * FROM randevular WHERE {tarih_sutunu} BETWEEN ? AND ?"
+        satirlar = self._sorgula(sorgu, (alt.strftime('%Y-%m-%d'), ust.strftime('%Y-%m-%d')))
+
+        for satir in satirlar:
+            zaman = randevu_zamani(satir)
+            if zaman is not None and alt < zaman <= ust:
+                yield satir
+
+    def _pencereyi_ilerlet(self, simdi):
+        """Heap'i simdi + pencere süresine kadar gönderilecek hatırlatmalarla doldurur."""
+        yeni_ust = simdi + self.pencere + self.onceden
+        # Uzun bir aradan sonra (uyku, takılan döngü) saati geçmiş randevular yüklenmez
+        if self._yuklenen_ust is None:
+            alt = self._son_tarama = simdi  # İlk yükleme aynı zamanda bir tarama sayılır
+        else:
+            alt = max(self._yuklenen_ust, simdi)
+        if yeni_ust <= alt:
+            return
+        for satir in self._satirlari_oku(alt, yeni_ust):
+            if satir['id'] not in self._gecerli_siralar:
+                self._ekle(satir)
+        self._yuklenen_ust = yeni_ust
+        self._gonderilenler = {randevu_id: zaman for randevu_id, zaman in self._gonderilenler.items()
+                               if zaman > simdi}
+
+    def _pencereyi_yenile(self, simdi):
+        """Yüklenmiş pencereyi veritabanıyla eşitler (başka süreçlerdeki değişiklikler için)."""
+        guncel = {satir['id']: satir for satir in self._satirlari_oku(simdi, self._yuklenen_ust)}
+        for randevu_id in list(self._kayitlar):
+            if randevu_id not in guncel:
+                self._cikar(randevu_id)
+        for randevu_id, satir in guncel.items():
+            eski = self._kayitlar.get(randevu_id)
+            if eski is None or randevu_zamani(eski) != randevu_zamani(satir):
+                self._cikar(randevu_id)
+                self._ekle(satir)
+        self._son_tarama = simdi
+
+    # --- Gönderilen hatırlatmaların kaydı ---
+
+    def _gonderilenleri_oku(self):
+        if not self.gonderilenler_dosyasi or not os.path.exists(self.gonderilenler_dosyasi):
+            return {}
+        with open(self.gonderilenler_dosyasi, encoding='utf-8') as f:
+            return {int(randevu_id): datetime.strptime(zaman, '%Y-%m-%d %H:%M')
+                    for randevu_id, zaman in json.load(f).items()}
+
+    def _gonderilenleri_yaz(self):
+        if not self.gonderilenler_dosyasi:
+            return
+        gecici_yol = self.gonderilenler_dosyasi + '.tmp'
+        with open(gecici_yol, 'w', encoding='utf-8') as f:
+            json.dump({str(randevu_id): zaman.strftime('%Y-%m-%d %H:%M')
+                       for randevu_id, zaman in self._gonderilenler.items()}, f)
+        os.replace(gecici_yol, self.gonderilenler_dosyasi)
+
+    # --- Heap işlemleri ---
+
+    def _ekle(self, satir, hatirlatma_zamani=None):
+        randevu_id = satir['id']
+        zaman = randevu_zamani(satir)
+        if self._gonderilenler.get(randevu_id) == zaman:
+            return
+        sira = next(self._sira)
+        self._gecerli_siralar[randevu_id] = sira
+        self._kayitlar[randevu_id] = satir
+        if hatirlatma_zamani is None:
+            hatirlatma_zamani = zaman - self.onceden
+        heapq.heappush(self._heap, (hatirlatma_zamani, sira, randevu_id))
+
+    def _cikar(self, randevu_id):
+        # Heap'teki eski kayıt yerinde kalır, sıra numarası eşleşmediği için gönderilmez.
+        self._gecerli_siralar.pop(randevu_id, None)
+        self._kayitlar.pop(randevu_id, None)
+
+    def randevu_degisti(self, veritabani, islem, randevu_id, onceki=None, sonraki=None):
+        """randevu.add_change_listener ile kaydedilen değişiklik bildirimi.
+
+        Başka bir veritabanındaki değişiklikler (randevu id'leri çakışabilir) yok sayılır.
+        """
+        if os.path.realpath(veritabani) != self._veritabani_yolu:
+            return
+        with self._kilit:
+            self._cikar(randevu_id)
+            if islem != 'delete' and sonraki is not None and self._yuklenen_ust is not None:
+                zaman = randevu_zamani(sonraki)
+                if zaman is not None and self._saat() < zaman <= self._yuklenen_ust:
+                    self._ekle(sonraki)
+        self._uyandir.set()
+
+    def isle(self, simdi=None):
+        """Zamanı gelmiş hatırlatmaları gönderir ve gönderilen sayısını döndürür."""
+        simdi = simdi or self._saat()
+        gonderilecekler = []
+        with self._kilit:
+            self._pencereyi_ilerlet(simdi)
+            if (self.yeniden_tarama is not None
+                    and (self._son_tarama is None or simdi - self._son_tarama >= self.yeniden_tarama)):
+                self._pencereyi_yenile(simdi)
+
+            adaylar = []
+            while self._heap and self._heap[0][0] <= simdi:
+                girdi = heapq.heappop(self._heap)
+                hatirlatma_zamani, sira, randevu_id = girdi
+                if self._gecerli_siralar.get(randevu_id) != sira:
+                    continue
+                satir = self._kayitlar.pop(randevu_id)
+                self._gecerli_siralar.pop(randevu_id)
+                # Randevu saati geçmişse hatırlatmanın anlamı kalmadı
+                if randevu_zamani(satir) > simdi:
+                    adaylar.append((girdi, satir))
+
+            # Başka bir süreçte silinmiş ya da taşınmış randevular için eski hatırlatmayı gönderme
+            try:
+                guncel = self._satirlari_getir([satir['id'] for _, satir in adaylar])
+            except Exception:
+                # Veritabanı okunamadıysa adayları sıraya geri koy, bir sonraki denemede gönderilsin
+                for girdi, satir in adaylar:
+                    heapq.heappush(self._heap, girdi)
+                    self._gecerli_siralar[satir['id']] = girdi[1]
+                    self._kayitlar[satir['id']] = satir
+                raise
+
+            for (hatirlatma_zamani, _, randevu_id), satir in adaylar:
+                yeni = guncel.get(randevu_id)
+                if yeni is None:
+                    continue
+                zaman = randevu_zamani(yeni)
+                if zaman != randevu_zamani(satir):
+                    if zaman is not None and simdi < zaman <= self._yuklenen_ust:
+                        self._ekle(yeni)
+                    continue
+                # Gönderim sürerken gelen bir bildirim aynı hatırlatmayı tekrar sıraya koymasın;
+                # gönderim başarısız olursa bu işaret geri alınır.
+                self._gonderilenler[randevu_id] = zaman
+                gonderilecekler.append((yeni, zaman, self._hatirlatma(yeni, hatirlatma_zamani)))
+
+        gonderilen_sayisi = 0
+        basarisizlar = []
+        for satir, zaman, hatirlatma in gonderilecekler:
+            try:
+                self.gonderici.gonder(hatirlatma)
+                gonderilen_sayisi += 1
+            except Exception as e:
+                logger.error("Randevu %s için hatırlatma gönderilemedi, tekrar denenecek: %s", satir['id'], e)
+                basarisizlar.append((satir, zaman))
+
+        if gonderilecekler:
+            with self._kilit:
+                for satir, zaman in basarisizlar:
+                    if self._gonderilenler.get(satir['id']) == zaman:
+                        del self._gonderilenler[satir['id']]
+                    if satir['id'] not in self._gecerli_siralar:
+                        self._ekle(satir, simdi + GONDERIM_TEKRAR_SURESI)
+                if gonderilen_sayisi:
+                    self._gonderilenleri_yaz()
+        return gonderilen_sayisi
+
+    def _hatirlatma(self, satir, hatirlatma_zamani):
+        return {
+            'randevu_id': satir['id'],
+            'randevu_zamani': randevu_zamani(satir).strftime('%Y-%m-%d %H:%M'),
+            'hatirlatma_zamani': hatirlatma_zamani.strftime('%Y-%m-%d %H:%M'),
+            'musteri': satir.get('musteri_adi') or satir.get('musteri_id'),
+            'berber': satir.get('berber_adi') or satir.get('kuafor_id'),
+        }
+
+    def siradaki_zaman(self):
+        """Heap'teki ilk geçerli hatırlatmanın zamanını döndürür, yoksa None."""
+        with self._kilit:
+            while self._heap and self._gecerli_siralar.get(self._heap[0][2]) != self._heap[0][1]:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    # --- Arka plan çalıştırma ---
+
+    def baslat(self):
+        """Hatırlatmaları arka planda göndermeye başlar.
+
+        Aynı süreçteki değişikliklerin anında yansıması için randevu_degisti
+        ayrıca add_change_listener ile kaydedilmelidir.
+        """
+        self._durdur.clear()
+        self._thread = threading.Thread(target=self._calis, name='hatirlatici', daemon=True)
+        self._thread.start()
+
+    def durdur(self):
+        self._durdur.set()
+        self._uyandir.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _calis(self):
+        hata_beklemesi = HATA_BEKLEMESI_MIN
+        while not self._durdur.is_set():
+            self._uyandir.clear()
+            try:
+                self.isle()
+            except Exception:
+                # Kilitli veritabanı vb. durumlarda iş parçacığı ölmesin, artan aralıklarla tekrar dene
+                logger.exception("Hatırlatmalar işlenemedi, %s sn sonra tekrar denenecek", hata_beklemesi)
+                self._durdur.wait(timeout=hata_beklemesi)
+                hata_beklemesi = min(hata_beklemesi * 2, HATA_BEKLEMESI_MAX)
+                continue
+            hata_beklemesi = HATA_BEKLEMESI_MIN
+
+            simdi = self._saat()
+            # Bir sonraki hatırlatmaya, pencerenin ilerletilmesine ya da yeniden taramaya kadar bekle
+            uyanma = self._yuklenen_ust - self.onceden
+            if self.yeniden_tarama is not None:
+                uyanma = min(uyanma, self._son_tarama + self.yeniden_tarama)
+            siradaki = self.siradaki_zaman()
+            if siradaki is not None:
+                uyanma = min(uyanma, siradaki)
+            bekleme = max((uyanma - simdi).total_seconds(), 0)
+            self._uyandir.wait(timeout=bekleme)
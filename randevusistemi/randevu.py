@@ -1,7 +1,16 @@
 import sqlite3
 from datetime import datetime
 
+from degisiklik_gunlugu import DegisiklikGunlugu, GunlukKullanimdaHatasi
+from hatirlatici import DosyaGonderici, HatirlaticiZamanlayici
+
 DATABASE_NAME = 'berber_randevu.db'
+JOURNAL_DIR = 'degisiklik_gunlugu'
+REMINDER_OUTBOX = 'hatirlatmalar.jsonl'
+SENT_REMINDERS_FILE = 'gonderilen_hatirlatmalar.json'
+
+# Randevu değişikliklerini izleyen fonksiyonlar (ör. hatırlatıcı zamanlayıcı)
+_change_listeners = []
 
 def connect_db():
     """Veritabanına bağlanır ve bağlantı nesnesini döndürür."""
@@ -27,6 +36,55 @@ def create_table():
     conn.close()
     print("Randevular tablosu oluşturuldu veya zaten mevcut.")
 
+def add_change_listener(listener):
+    """Randevu değişikliklerinde çağrılacak bir fonksiyon kaydeder.
+
+    Fonksiyon listener(veritabani, islem, appointment_id, onceki, sonraki)
+    şeklinde çağrılır. veritabani değişikliğin yapıldığı veritabanı dosyasıdır;
+    randevu.py ve app.py farklı veritabanları kullandığı ve id'leri
+    çakışabildiği için dinleyiciler kendi veritabanları dışındaki
+    değişiklikleri yok saymalıdır. islem 'insert', 'update' veya 'delete'
+    olur; onceki ve sonraki satırın sözlük halidir (yoksa None).
+    """
+    _change_listeners.append(listener)
+
+def remove_change_listener(listener):
+    """add_change_listener ile kaydedilen fonksiyonu kaldırır."""
+    if listener in _change_listeners:
+        _change_listeners.remove(listener)
+
+def notify_change(veritabani, islem, appointment_id, onceki=None, sonraki=None):
+    """Kayıtlı dinleyicilere değişikliği bildirir. Değişiklik commit edildikten sonra çağrılmalıdır."""
+    for listener in list(_change_listeners):
+        try:
+            listener(veritabani, islem, appointment_id, onceki, sonraki)
+        except Exception as e:
+            print(f"Randevu değişikliği bildirilirken bir hata oluştu: {e}")
+
+def start_journal():
+    """Değişiklik günlüğünü açar ve dinleyici olarak kaydeder.
+
+    Etkileşimli kullanımda her değişiklik commit'ten hemen sonra diske
+    yazılsın diye toplu yazma kapalıdır. Günlük başka bir süreçte açıksa
+    uyarı verir ve None döndürür; bu süreçteki değişiklikler günlüğü açan
+    sürecin bir sonraki açılışındaki mutabakatta günlüğe eklenir.
+    """
+    try:
+        journal = DegisiklikGunlugu(JOURNAL_DIR, DATABASE_NAME, toplu_boyut=1)
+    except GunlukKullanimdaHatasi as e:
+        print(f"Uyarı: Değişiklik günlüğü açılamadı: {e}")
+        return None
+    add_change_listener(journal.kaydet)
+    return journal
+
+def fetch_appointment_row(cursor, appointment_id):
+    """Randevu satırını sütun adlarıyla sözlük olarak döndürür, bulunamazsa None."""
+    cursor.execute("SELECT * FROM randevular WHERE id = ?", (appointment_id,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip([column[0] for column in cursor.description], row))
+
 def convert_date_to_db_format(date_str):
     """GG-AA-YYYY formatındaki tarihi YYYY-MM-DD formatına dönüştürür."""
     try:
@@ -44,21 +102,23 @@ def convert_date_from_db_format(date_str):
         return None
 
 def add_appointment(musteri_adi, tarih_gg_aa_yyyy, saat, berber_adi=None):
-    """Yeni bir randevu ekler."""
+    """Yeni bir randevu ekler ve sonuç mesajını döndürür."""
     tarih_db_format = convert_date_to_db_format(tarih_gg_aa_yyyy)
     if not tarih_db_format:
-        print("Hata: Geçersiz tarih formatı. Lütfen GG-AA-YYYY formatında girin.")
-        return
+        return "Hata: Geçersiz tarih formatı. Lütfen GG-AA-YYYY formatında girin."
 
     conn = connect_db()
     cursor = conn.cursor()
     try:
         cursor.execute("INSERT INTO randevular (musteri_adi, tarih, saat, berber_adi) VALUES (?, ?, ?, ?)",
                        (musteri_adi, tarih_db_format, saat, berber_adi))
+        appointment_id = cursor.lastrowid
+        sonraki = fetch_appointment_row(cursor, appointment_id)
         conn.commit()
-        print(f"{musteri_adi} için {tarih_gg_aa_yyyy} {saat} tarihine randevu başarıyla eklendi.")
+        notify_change(DATABASE_NAME, 'insert', appointment_id, None, sonraki)
+        return f"{musteri_adi} için {tarih_gg_aa_yyyy} {saat} tarihine randevu başarıyla eklendi."
     except sqlite3.Error as e:
-        print(f"Randevu eklenirken bir hata oluştu: {e}")
+        return f"Randevu eklenirken bir hata oluştu: {e}"
     finally:
         conn.close()
 
@@ -98,7 +158,7 @@ def get_appointments_by_date(tarih_gg_aa_yyyy):
     return formatted_appointments
 
 def update_appointment(appointment_id, new_musteri_adi=None, new_tarih_gg_aa_yyyy=None, new_saat=None, new_berber_adi=None):
-    """Mevcut bir randevuyu günceller."""
+    """Mevcut bir randevuyu günceller ve sonuç mesajını döndürür."""
     conn = connect_db()
     cursor = conn.cursor()
     update_fields = []
@@ -111,9 +171,8 @@ def update_appointment(appointment_id, new_musteri_adi=None, new_tarih_gg_aa_yyy
     if new_tarih_gg_aa_yyyy:
         new_tarih_db_format = convert_date_to_db_format(new_tarih_gg_aa_yyyy)
         if not new_tarih_db_format:
-            print("Hata: Güncellenecek tarih için geçersiz format. Lütfen GG-AA-YYYY formatında girin.")
             conn.close()
-            return
+            return "Hata: Güncellenecek tarih için geçersiz format. Lütfen GG-AA-YYYY formatında girin."
         update_fields.append("tarih = ?")
         update_values.append(new_tarih_db_format)
     
@@ -125,38 +184,44 @@ def update_appointment(appointment_id, new_musteri_adi=None, new_tarih_gg_aa_yyy
         update_values.append(new_berber_adi)
 
     if not update_fields:
-        print("Güncellenecek alan bulunamadı.")
         conn.close()
-        return
+        return "Güncellenecek alan bulunamadı."
 
     update_query = f"UPDATE randevular SET {', '.join(update_fields)} WHERE id = ?"
     update_values.append(appointment_id)
 
     try:
+        onceki = fetch_appointment_row(cursor, appointment_id)
         cursor.execute(update_query, tuple(update_values))
+        updated = cursor.rowcount > 0
+        sonraki = fetch_appointment_row(cursor, appointment_id)
         conn.commit()
-        if cursor.rowcount > 0:
-            print(f"Randevu ID {appointment_id} başarıyla güncellendi.")
+        if updated:
+            notify_change(DATABASE_NAME, 'update', appointment_id, onceki, sonraki)
+            return f"Randevu ID {appointment_id} başarıyla güncellendi."
         else:
-            print(f"Randevu ID {appointment_id} bulunamadı.")
+            return f"Randevu ID {appointment_id} bulunamadı."
     except sqlite3.Error as e:
-        print(f"Randevu güncellenirken bir hata oluştu: {e}")
+        return f"Randevu güncellenirken bir hata oluştu: {e}"
     finally:
         conn.close()
 
 def delete_appointment(appointment_id):
-    """Belirli bir randevuyu siler."""
+    """Belirli bir randevuyu siler ve sonuç mesajını döndürür."""
     conn = connect_db()
     cursor = conn.cursor()
     try:
+        onceki = fetch_appointment_row(cursor, appointment_id)
         cursor.execute("DELETE FROM randevular WHERE id = ?", (appointment_id,))
+        deleted = cursor.rowcount > 0
         conn.commit()
-        if cursor.rowcount > 0:
-            print(f"Randevu ID {appointment_id} başarıyla silindi.")
+        if deleted:
+            notify_change(DATABASE_NAME, 'delete', appointment_id, onceki, None)
+            return f"Randevu ID {appointment_id} başarıyla silindi."
         else:
-            print(f"Randevu ID {appointment_id} bulunamadı.")
+            return f"Randevu ID {appointment_id} bulunamadı."
     except sqlite3.Error as e:
-        print(f"Randevu silinirken bir hata oluştu: {e}")
+        return f"Randevu silinirken bir hata oluştu: {e}"
     finally:
         conn.close()
 
@@ -178,7 +243,7 @@ def main_menu():
             tarih = input("Randevu Tarihi (GG-AA-YYYY): ")
             saat = input("Randevu Saati (SS:DD): ")
             berber_adi = input("Berber Adı (isteğe bağlı): ")
-            add_appointment(musteri_adi, tarih, saat, berber_adi if berber_adi else None)
+            print(add_appointment(musteri_adi, tarih, saat, berber_adi if berber_adi else None))
         elif choice == '2':
             appointments = get_all_appointments()
             if appointments:
@@ -209,16 +274,16 @@ def main_menu():
             new_saat = input("Yeni saat (SS:DD) (değiştirmek istemiyorsanız boş bırakın): ")
             new_berber_adi = input("Yeni berber adı (değiştirmek istemiyorsanız boş bırakın): ")
 
-            update_appointment(app_id,
-                               new_musteri_adi if new_musteri_adi else None,
-                               new_tarih if new_tarih else None,
-                               new_saat if new_saat else None,
-                               new_berber_adi if new_berber_adi else None)
+            print(update_appointment(app_id,
+                                     new_musteri_adi if new_musteri_adi else None,
+                                     new_tarih if new_tarih else None,
+                                     new_saat if new_saat else None,
+                                     new_berber_adi if new_berber_adi else None))
         elif choice == '5':
             app_id = input("Silinecek randevunun ID'sini girin: ")
             try:
                 app_id = int(app_id)
-                delete_appointment(app_id)
+                print(delete_appointment(app_id))
             except ValueError:
                 print("Geçersiz ID. Lütfen sayısal bir değer girin.")
         elif choice == '0':
@@ -229,4 +294,10 @@ def main_menu():
 
 if __name__ == "__main__":
     create_table()
-    main_menu()
\ No newline at end of file
+    start_journal()
+    reminders = HatirlaticiZamanlayici(DosyaGonderici(REMINDER_OUTBOX), DATABASE_NAME,
+                                       gonderilenler_dosyasi=SENT_REMINDERS_FILE)
+    add_change_listener(reminders.randevu_degisti)
+    reminders.baslat()
+    main_menu()
+    reminders.durdur()
\ No newline at end of file
@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+
+from sifreleme import DogrulamaHavuzu, sifre_dogrula, sifre_hashle
+
+# Karşılaştırılacak maliyet ayarları
+MALIYET_AYARLARI = [
+    {'algoritma': 'scrypt', 'n': 2 ** 12, 'r': 8, 'p': 1},
+    {'algoritma': 'scrypt', 'n': 2 ** 14, 'r': 8, 'p': 1},
+    {'algoritma': 'scrypt', 'n': 2 ** 15, 'r': 8, 'p': 1},
+    {'algoritma': 'pbkdf2_sha256', 'iterasyon': 100_000},
+    {'algoritma': 'pbkdf2_sha256', 'iterasyon': 600_000},
+]
+
+
+def ayar_adi(parametreler):
+    if parametreler['algoritma'] == 'scrypt':
+        return f"scrypt n={parametreler['n']} r={parametreler['r']} p={parametreler['p']}"
+    return f"pbkdf2_sha256 iterasyon={parametreler['iterasyon']}"
+
+
+def tek_is_parcacigi(saklanan, giris_sayisi):
+    baslangic = time.perf_counter()
+    for _ in range(giris_sayisi):
+        sifre_dogrula('gizli-sifre', saklanan)
+    return giris_sayisi / (time.perf_counter() - baslangic)
+
+
+def havuzla(saklanan, giris_sayisi, isci_sayisi):
+    with DogrulamaHavuzu(isci_sayisi) as havuz:
+        baslangic = time.perf_counter()
+        isler = [havuz.calistir(sifre_dogrula, 'gizli-sifre', saklanan) for _ in range(giris_sayisi)]
+        for is_ in isler:
+            is_.result()
+        return giris_sayisi / (time.perf_counter() - baslangic)
+
+
+def main():
+    giris_sayisi = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    isci_sayisi = os.cpu_count() or 1
+
+    print(f"Her ayar için {giris_sayisi} giriş, havuzda {isci_sayisi} işçi")
+    print(f"{'Ayar':<36} {'giriş/sn (tek)':>15} {'giriş/sn (havuz)':>17}")
+    for parametreler in MALIYET_AYARLARI:
+        saklanan = sifre_hashle('gizli-sifre', parametreler)
+        tek = tek_is_parcacigi(saklanan, giris_sayisi)
+        paralel = havuzla(saklanan, giris_sayisi, isci_sayisi)
+        print(f"{ayar_adi(parametreler):<36} {tek:>15.1f} {paralel:>17.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+import hashlib
+import hmac
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Saklanan biçim:
+#   scrypt$n$r$p$tuz_hex$ozet_hex
+#   pbkdf2_sha256$iterasyon$tuz_hex$ozet_hex
+# Parametreler hash'in içinde durduğu için maliyet ayarları değiştiğinde
+# eski kayıtlar doğrulanmaya devam eder, girişte yeni ayarlarla yeniden hash'lenir.
+
+TUZ_UZUNLUGU = 16
+OZET_UZUNLUGU = 32
+
+# Maliyet ayarları. Değiştirildiğinde mevcut şifreler bir sonraki girişte güncellenir.
+SIFRE_PARAMETRELERI = {
+    'algoritma': 'scrypt',
+    'n': 2 ** 14,
+    'r': 8,
+    'p': 1,
+    'iterasyon': 600_000,  # pbkdf2_sha256 için
+}
+
+
+def _scrypt(sifre, tuz, n, r, p):
+    # OpenSSL'in varsayılan 32 MB sınırı yüksek n değerleri için yetmeyebilir.
+    maxmem = 128 * r * (n + p + 2) + 1024 * 1024
+    return hashlib.scrypt(sifre.encode('utf-8'), salt=tuz, n=n, r=r, p=p,
+                          maxmem=maxmem, dklen=OZET_UZUNLUGU)
+
+
+def _pbkdf2(sifre, tuz, iterasyon):
+    return hashlib.pbkdf2_hmac('sha256', sifre.encode('utf-8'), tuz, iterasyon,
+                               dklen=OZET_UZUNLUGU)
+
+
+def sifre_hashle(sifre, parametreler=None):
+    """Şifreyi rastgele tuzla hash'ler ve saklanacak metni döndürür."""
+    parametreler = parametreler or SIFRE_PARAMETRELERI
+    tuz = os.urandom(TUZ_UZUNLUGU)
+    algoritma = parametreler['algoritma']
+    if algoritma == 'scrypt':
+        n, r, p = parametreler['n'], parametreler['r'], parametreler['p']
+        ozet = _scrypt(sifre, tuz, n, r, p)
+        return f"scrypt${n}${r}${p}${tuz.hex()}${ozet.hex()}"
+    if algoritma == 'pbkdf2_sha256':
+        iterasyon = parametreler['iterasyon']
+        ozet = _pbkdf2(sifre, tuz, iterasyon)
+        return f"pbkdf2_sha256${iterasyon}${tuz.hex()}${ozet.hex()}"
+    raise ValueError(f"Desteklenmeyen algoritma: {algoritma}")
+
+
+# Bozuk ya da aşırı maliyetli parametreli kayıtların KDF'ye gitmemesi için sınırlar
+SCRYPT_N_MAX = 2 ** 20
+SCRYPT_R_MAX = 32
+SCRYPT_P_MAX = 16
+PBKDF2_ITERASYON_MAX = 10_000_000
+
+# _coz'un bilinen bir algoritma öneki taşıyan ama çözülemeyen kayıtlar için döndürdüğü değer
+BOZUK_KAYIT = 'bozuk'
+
+
+def _coz(saklanan):
+    """Saklanan hash metnini (algoritma, parametreler, tuz, özet) olarak ayırır.
+
+    Hash biçiminde olmayan (eski, düz metin) kayıtlar için None döner.
+    Algoritma öneki tanınan ama biçimi ya da parametreleri geçersiz olan
+    kayıtlar için BOZUK_KAYIT döner; bunlar hiçbir şifreyle doğrulanmaz.
+    """
+    parcalar = saklanan.split('$')
+    if parcalar[0] not in ('scrypt', 'pbkdf2_sha256'):
+        return None
+    try:
+        if parcalar[0] == 'scrypt' and len(parcalar) == 6:
+            n, r, p = int(parcalar[1]), int(parcalar[2]), int(parcalar[3])
+            tuz, ozet = bytes.fromhex(parcalar[4]), bytes.fromhex(parcalar[5])
+            if (1 < n <= SCRYPT_N_MAX and n & (n - 1) == 0 and 0 < r <= SCRYPT_R_MAX
+                    and 0 < p <= SCRYPT_P_MAX and tuz and ozet):
+                return 'scrypt', {'n': n, 'r': r, 'p': p}, tuz, ozet
+        if parcalar[0] == 'pbkdf2_sha256' and len(parcalar) == 4:
+            iterasyon = int(parcalar[1])
+            tuz, ozet = bytes.fromhex(parcalar[2]), bytes.fromhex(parcalar[3])
+            if 0 < iterasyon <= PBKDF2_ITERASYON_MAX and tuz and ozet:
+                return 'pbkdf2_sha256', {'iterasyon': iterasyon}, tuz, ozet
+    except ValueError:
+        pass
+    return BOZUK_KAYIT
+
+
+# Güncel ayarlarla üretilmiş sahte hash'ler, ayarlara göre önbellekte tutulur
+_sahte_hashler = {}
+
+
+def sahte_dogrulama(sifre, parametreler=None):
+    """Bilinmeyen kullanıcı için güncel ayarlarla bir doğrulama yapar, her zaman False döndürür.
+
+    Böylece var olan ve olmayan kullanıcı adları için yanıt süresi aynı kalır.
+    """
+    parametreler = parametreler or SIFRE_PARAMETRELERI
+    anahtar = tuple(sorted(parametreler.items()))
+    sahte_hash = _sahte_hashler.get(anahtar)
+    if sahte_hash is None:
+        sahte_hash = _sahte_hashler.setdefault(anahtar, sifre_hashle(os.urandom(16).hex(), parametreler))
+    sifre_dogrula(sifre, sahte_hash)
+    return False
+
+
+def sifre_dogrula(sifre, saklanan):
+    """Şifre saklanan değerle eşleşiyorsa True döndürür.
+
+    Hash'lenmemiş eski kayıtlar sabit zamanlı karşılaştırmayla kontrol edilir;
+    süre farkı olmaması için yine de bir sahte doğrulama yapılır.
+    """
+    cozulmus = _coz(saklanan)
+    if cozulmus is None:
+        sahte_dogrulama(sifre)
+        return hmac.compare_digest(sifre.encode('utf-8'), saklanan.encode('utf-8'))
+    if cozulmus is BOZUK_KAYIT:
+        sahte_dogrulama(sifre)
+        return False
+
+    algoritma, parametreler, tuz, beklenen = cozulmus
+    if algoritma == 'scrypt':
+        ozet = _scrypt(sifre, tuz, parametreler['n'], parametreler['r'], parametreler['p'])
+    else:
+        ozet = _pbkdf2(sifre, tuz, parametreler['iterasyon'])
+    return hmac.compare_digest(ozet, beklenen)
+
+
+def yeniden_hash_gerekli_mi(saklanan, parametreler=None):
+    """Saklanan değer güncel ayarlarla üretilmemişse True döndürür."""
+    parametreler = parametreler or SIFRE_PARAMETRELERI
+    cozulmus = _coz(saklanan)
+    if cozulmus is None or cozulmus is BOZUK_KAYIT:
+        return True
+    algoritma, saklanan_parametreler, tuz, ozet = cozulmus
+    if algoritma != parametreler['algoritma'] or len(ozet) != OZET_UZUNLUGU:
+        return True
+    return any(saklanan_parametreler[anahtar] != parametreler[anahtar]
+               for anahtar in saklanan_parametreler)
+
+
+def dogrula_ve_guncelle(sifre, saklanan, parametreler=None):
+    """Şifreyi doğrular; gerekiyorsa yeni hash'i de üretir.
+
+    (dogru_mu, yeni_hash) döndürür. yeni_hash yalnızca şifre doğruysa ve
+    saklanan değer güncel ayarlarla üretilmemişse doludur, aksi halde None'dır.
+    """
+    if not sifre_dogrula(sifre, saklanan):
+        return False, None
+    if yeniden_hash_gerekli_mi(saklanan, parametreler):
+        return True, sifre_hashle(sifre, parametreler)
+    return True, None
+
+
+class DogrulamaHavuzu:
+    """Şifre doğrulamalarını arka planda çalıştıran havuz.
+
+    hashlib'in scrypt ve pbkdf2 uygulamaları hesaplama sırasında GIL'i
+    bıraktığından varsayılan iş parçacığı havuzu birden çok çekirdeği kullanır.
+    surec=True verildiğinde bunun yerine süreç havuzu kullanılır.
+    """
+
+    def __init__(self, isci_sayisi=None, surec=False):
+        if surec:
+            self._havuz = ProcessPoolExecutor(max_workers=isci_sayisi)
+        else:
+            self._havuz = ThreadPoolExecutor(max_workers=isci_sayisi,
+                                             thread_name_prefix='sifre-dogrulama')
+
+    def dogrula(self, sifre, saklanan, parametreler=None):
+        """dogrula_ve_guncelle sonucunu taşıyan bir Future döndürür."""
+        return self._havuz.submit(dogrula_ve_guncelle, sifre, saklanan, parametreler)
+
+    def hashle(self, sifre, parametreler=None):
+        """sifre_hashle sonucunu taşıyan bir Future döndürür."""
+        return self._havuz.submit(sifre_hashle, sifre, parametreler)
+
+    def calistir(self, fonksiyon, *args):
+        """Herhangi bir doğrulama işini (ör. veritabanı okumasıyla birlikte) havuza gönderir."""
+        return self._havuz.submit(fonksiyon, *args)
+
+    def kapat(self, bekle=True):
+        self._havuz.shutdown(wait=bekle)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.kapat()
@@ -0,0 +1,206 @@
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+import degisiklik_gunlugu
+import randevu
+from degisiklik_gunlugu import DegisiklikGunlugu, durumu_olustur, geri_yukle
+
+
+@pytest.fixture
+def dizin(tmp_path):
+    return str(tmp_path / 'gunluk')
+
+
+def _gunluk(dizin, veritabani, **kwargs):
+    gunluk = DegisiklikGunlugu(dizin, veritabani, **kwargs)
+    randevu.add_change_listener(gunluk.kaydet)
+    return gunluk
+
+
+def _kapat(gunluk):
+    randevu.remove_change_listener(gunluk.kaydet)
+    gunluk.kapat()
+
+
+def _simdi():
+    zaman = datetime.now(timezone.utc)
+    time.sleep(0.001)
+    return zaman
+
+
+def _musteriler(satirlar):
+    return sorted(satir['musteri_adi'] for satir in satirlar.values())
+
+
+def test_belirli_zamana_geri_yukleme(veritabani, dizin, tmp_path):
+    randevu.add_appointment('Eski', '01-10-2026', '10:00')
+    gunluk = _gunluk(dizin, veritabani)
+    randevu.add_appointment('Ali', '19-10-2026', '10:30')
+    randevu.update_appointment(2, new_saat='11:00')
+    silmeden_once = _simdi()
+    randevu.delete_appointment(2)
+    _kapat(gunluk)
+
+    satirlar, _ = durumu_olustur(dizin, silmeden_once)
+    assert _musteriler(satirlar) == ['Ali', 'Eski']
+    assert satirlar[2]['saat'] == '11:00'
+    assert _musteriler(durumu_olustur(dizin)[0]) == ['Eski']
+
+    hedef = str(tmp_path / 'geri.db')
+    assert geri_yukle(dizin, silmeden_once, hedef) == 2
+    conn = sqlite3.connect(hedef)
+    assert conn.execute("SELECT id, musteri_adi, saat FROM randevular ORDER BY id").fetchall() == [
+        (1, 'Eski', '10:00'), (2, 'Ali', '11:00')]
+    conn.close()
+
+    with pytest.raises(FileExistsError):
+        geri_yukle(dizin, silmeden_once, hedef)
+
+
+def test_checkpoint_secimi(veritabani, dizin):
+    gunluk = _gunluk(dizin, veritabani, checkpoint_araligi=2)
+    zamanlar = []
+    for i in range(5):
+        randevu.add_appointment(f"Musteri{i}", '19-10-2026', '10:00')
+        zamanlar.append(_simdi())
+    _kapat(gunluk)
+
+    assert len(degisiklik_gunlugu._checkpointler(dizin)) == 3
+    for i, zaman in enumerate(zamanlar):
+        satirlar, checkpoint = durumu_olustur(dizin, zaman)
+        assert len(satirlar) == i + 1
+        assert checkpoint['seq'] == (i + 1) // 2 * 2
+
+    with pytest.raises(ValueError):
+        durumu_olustur(dizin, datetime(2000, 1, 1))
+
+
+def test_yalnizca_secilen_checkpoint_okunur(veritabani, dizin, monkeypatch):
+    gunluk = _gunluk(dizin, veritabani, checkpoint_araligi=1)
+    randevu.add_appointment('Ali', '19-10-2026', '10:30')
+    ilk_eklemeden_sonra = _simdi()
+    for i in range(5):
+        randevu.add_appointment(f"Musteri{i}", '19-10-2026', '11:00')
+    _kapat(gunluk)
+
+    okunanlar = []
+    asil_oku = degisiklik_gunlugu._checkpoint_oku
+
+    def oku(yol):
+        okunanlar.append(yol)
+        return asil_oku(yol)
+
+    monkeypatch.setattr(degisiklik_gunlugu, '_checkpoint_oku', oku)
+    satirlar, checkpoint = durumu_olustur(dizin, ilk_eklemeden_sonra)
+    assert _musteriler(satirlar) == ['Ali']
+    assert checkpoint['seq'] == 1
+    assert len(okunanlar) == 1
+
+
+def test_baska_veritabanindaki_degisiklik_gunluge_yazilmaz(veritabani, dizin, tmp_path):
+    randevu.add_appointment('Ali', '19-10-2026', '10:30')
+    gunluk = _gunluk(dizin, veritabani)
+    # app.py'nin veritabanında aynı id'ye sahip bir randevu silinmiş gibi bildir
+    randevu.notify_change(str(tmp_path / 'kuafor.db'), 'delete', 1, {'id': 1}, None)
+    _kapat(gunluk)
+
+    assert _musteriler(durumu_olustur(dizin)[0]) == ['Ali']
+    assert os.path.getsize(os.path.join(dizin, degisiklik_gunlugu.GUNLUK_DOSYASI)) == 0
+
+
+def test_komut_satiri_sqlite_hatasini_bildirir(veritabani, dizin, tmp_path, monkeypatch, capsys):
+    _kapat(_gunluk(dizin, veritabani))
+    # Var olmayan klasördeki hedef sqlite3.OperationalError verir
+    hedef = str(tmp_path / 'yok' / 'geri.db')
+    monkeypatch.setattr('sys.argv', ['degisiklik_gunlugu.py', dizin, '2100-01-01 00:00', hedef])
+    degisiklik_gunlugu.main()
+    assert capsys.readouterr().out.startswith('Hata:')
+
+
+def test_yarim_kalan_kayit_atilir(veritabani, dizin):
+    gunluk = _gunluk(dizin, veritabani)
+    randevu.add_appointment('Ali', '19-10-2026', '10:30')
+    _kapat(gunluk)
+    gunluk_yolu = os.path.join(dizin, degisiklik_gunlugu.GUNLUK_DOSYASI)
+    with open(gunluk_yolu, 'ab') as f:
+        f.write(b'{"seq":2,"ts":')
+
+    assert _musteriler(durumu_olustur(dizin)[0]) == ['Ali']
+    gunluk = _gunluk(dizin, veritabani)
+    randevu.add_appointment('Veli', '19-10-2026', '11:00')
+    _kapat(gunluk)
+    assert _musteriler(durumu_olustur(dizin)[0]) == ['Ali', 'Veli']
+    with open(gunluk_yolu, 'rb') as f:
+        assert f.read().count(b'\n') == 2
+
+
+def test_dinleyici_disindaki_degisiklik_acilista_eklenir(veritabani, dizin):
+    randevu.add_appointment('Ali', '19-10-2026', '10:30')
+    randevu.add_appointment('Veli', '19-10-2026', '11:00')
+    _kapat(_gunluk(dizin, veritabani))
+    silmeden_once = _simdi()
+
+    conn = sqlite3.connect(veritabani)
+    conn.execute("DELETE FROM randevular WHERE id = 1")
+    conn.execute("UPDATE randevular SET saat = '12:00' WHERE id = 2")
+    conn.commit()
+    conn.close()
+
+    gunluk = _gunluk(dizin, veritabani)
+    _kapat(gunluk)
+    satirlar = durumu_olustur(dizin)[0]
+    assert list(satirlar) == [2]
+    assert satirlar[2]['saat'] == '12:00'
+    assert _musteriler(durumu_olustur(dizin, silmeden_once)[0]) == ['Ali', 'Veli']
+
+
+def test_gunluk_dosyasi_kayipsa_yeniden_baslar(veritabani, dizin):
+    randevu.add_appointment('Ali', '19-10-2026', '10:30')
+    gunluk = _gunluk(dizin, veritabani)
+    randevu.add_appointment('Veli', '19-10-2026', '11:00')
+    _kapat(gunluk)
+    os.remove(os.path.join(dizin, degisiklik_gunlugu.GUNLUK_DOSYASI))
+
+    gunluk = _gunluk(dizin, veritabani)
+    randevu.add_appointment('Can', '19-10-2026', '12:00')
+    _kapat(gunluk)
+    assert _musteriler(durumu_olustur(dizin)[0]) == ['Ali', 'Can', 'Veli']
+
+
+def test_bekleyen_kayitlar_sure_dolunca_yazilir(veritabani, dizin):
+    gunluk = _gunluk(dizin, veritabani, toplu_boyut=100, bekleme_suresi=0.05)
+    randevu.add_appointment('Ali', '19-10-2026', '10:30')
+    gunluk_yolu = os.path.join(dizin, degisiklik_gunlugu.GUNLUK_DOSYASI)
+    assert os.path.getsize(gunluk_yolu) == 0
+
+    time.sleep(0.5)
+    with open(gunluk_yolu, 'rb') as f:
+        assert f.read().count(b'\n') == 1
+    _kapat(gunluk)
+
+
+def test_saat_geri_alinsa_da_ts_azalmaz(veritabani, dizin, monkeypatch):
+    gunluk = _gunluk(dizin, veritabani)
+    randevu.add_appointment('Ali', '19-10-2026', '10:30')
+    monkeypatch.setattr(degisiklik_gunlugu, '_simdi', lambda: '2000-01-01T00:00:00.000000+00:00')
+    randevu.add_appointment('Veli', '19-10-2026', '11:00')
+    _kapat(gunluk)
+
+    with open(os.path.join(dizin, degisiklik_gunlugu.GUNLUK_DOSYASI), 'rb') as f:
+        ts = [json.loads(satir)['ts'] for satir in f]
+    assert ts[0] == ts[1]
+    assert _musteriler(durumu_olustur(dizin, ts[1])[0]) == ['Ali', 'Veli']
+
+
+@pytest.mark.skipif(degisiklik_gunlugu.fcntl is None, reason="dizin kilidi yalnızca POSIX'te")
+def test_ayni_dizin_iki_surecte_acilamaz(veritabani, dizin):
+    gunluk = DegisiklikGunlugu(dizin, veritabani)
+    with pytest.raises(degisiklik_gunlugu.GunlukKullanimdaHatasi):
+        DegisiklikGunlugu(dizin, veritabani)
+    gunluk.kapat()
+    DegisiklikGunlugu(dizin, veritabani).kapat()
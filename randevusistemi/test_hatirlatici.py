@@ -0,0 +1,201 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+import hatirlatici
+import randevu
+
+SIMDI = datetime(2026, 10, 19, 9, 0)
+
+
+class ListeGonderici:
+    def __init__(self):
+        self.gonderilenler = []
+
+    def gonder(self, hatirlatma):
+        self.gonderilenler.append(hatirlatma)
+
+
+class BozukGonderici(ListeGonderici):
+    def __init__(self, hata_sayisi):
+        super().__init__()
+        self.hata_sayisi = hata_sayisi
+
+    def gonder(self, hatirlatma):
+        if self.hata_sayisi:
+            self.hata_sayisi -= 1
+            raise ConnectionError("SMTP sunucusuna bağlanılamadı")
+        super().gonder(hatirlatma)
+
+
+@pytest.fixture
+def saat():
+    return [SIMDI]
+
+
+def _zamanlayici(veritabani, saat, **kwargs):
+    zamanlayici = hatirlatici.HatirlaticiZamanlayici(ListeGonderici(), veritabani,
+                                                     saat=lambda: saat[0], **kwargs)
+    randevu.add_change_listener(zamanlayici.randevu_degisti)
+    return zamanlayici
+
+
+def _gonderilen_idler(zamanlayici):
+    return [hatirlatma['randevu_id'] for hatirlatma in zamanlayici.gonderici.gonderilenler]
+
+
+def test_randevu_zamani_iki_sema():
+    assert hatirlatici.randevu_zamani({'tarih': '2026-10-19', 'saat': '10:30'}) == datetime(2026, 10, 19, 10, 30)
+    assert hatirlatici.randevu_zamani(
+        {'randevu_tarihi': '2026-10-19', 'randevu_saati': '10:30', 'durum': 'Onaylandı'}) == datetime(2026, 10, 19, 10, 30)
+    assert hatirlatici.randevu_zamani(
+        {'randevu_tarihi': '2026-10-19', 'randevu_saati': '10:30', 'durum': 'İptal'}) is None
+
+
+def test_zamani_gelen_hatirlatma_gonderilir(veritabani, saat):
+    randevu.add_appointment('Ali', '19-10-2026', '10:30')
+    randevu.add_appointment('Veli', '20-10-2026', '10:30')
+    zamanlayici = _zamanlayici(veritabani, saat)
+
+    assert zamanlayici.isle() == 0
+    assert zamanlayici.siradaki_zaman() == datetime(2026, 10, 19, 9, 30)
+    saat[0] = datetime(2026, 10, 19, 9, 30)
+    assert zamanlayici.isle() == 1
+    assert _gonderilen_idler(zamanlayici) == [1]
+    assert zamanlayici.isle() == 0
+
+
+def test_tasinan_ve_silinen_randevu(veritabani, saat):
+    randevu.add_appointment('Ali', '19-10-2026', '10:30')
+    randevu.add_appointment('Veli', '19-10-2026', '11:00')
+    zamanlayici = _zamanlayici(veritabani, saat)
+    zamanlayici.isle()
+
+    randevu.update_appointment(1, new_saat='12:00')
+    randevu.delete_appointment(2)
+    randevu.add_appointment('Can', '19-10-2026', '10:45')
+
+    saat[0] = datetime(2026, 10, 19, 10, 0)
+    zamanlayici.isle()
+    assert _gonderilen_idler(zamanlayici) == [3]
+
+    saat[0] = datetime(2026, 10, 19, 11, 0)
+    zamanlayici.isle()
+    assert _gonderilen_idler(zamanlayici) == [3, 1]
+    assert zamanlayici.gonderici.gonderilenler[1]['randevu_zamani'] == '2026-10-19 12:00'
+
+
+def test_baska_surecte_silinen_randevu_hatirlatilmaz(veritabani, saat):
+    randevu.add_appointment('Ali', '19-10-2026', '10:30')
+    zamanlayici = _zamanlayici(veritabani, saat)
+    zamanlayici.isle()
+
+    # Dinleyiciye haber vermeden, başka bir süreç gibi sil
+    conn = sqlite3.connect(veritabani)
+    conn.execute("DELETE FROM randevular WHERE id = 1")
+    conn.commit()
+    conn.close()
+
+    saat[0] = datetime(2026, 10, 19, 9, 30)
+    assert zamanlayici.isle() == 0
+
+
+def test_yeniden_baslatmada_tekrar_gonderilmez(veritabani, saat, tmp_path):
+    dosya = str(tmp_path / 'gonderilenler.json')
+    randevu.add_appointment('Ali', '19-10-2026', '09:30')
+    assert _zamanlayici(veritabani, saat, gonderilenler_dosyasi=dosya).isle() == 1
+    with open(dosya) as f:
+        assert json.load(f) == {'1': '2026-10-19 09:30'}
+
+    assert _zamanlayici(veritabani, saat, gonderilenler_dosyasi=dosya).isle() == 0
+
+
+def test_uzun_aradan_sonra_gecmis_randevu_hatirlatilmaz(veritabani, saat):
+    zamanlayici = _zamanlayici(veritabani, saat, pencere=timedelta(hours=1), yeniden_tarama=None)
+    zamanlayici.isle()
+    randevu.remove_change_listener(zamanlayici.randevu_degisti)
+    randevu.add_appointment('Ali', '19-10-2026', '12:00')
+    randevu.add_appointment('Veli', '19-10-2026', '15:30')
+
+    saat[0] = datetime(2026, 10, 19, 15, 0)
+    zamanlayici.isle()
+    assert _gonderilen_idler(zamanlayici) == [2]
+
+
+def test_calisma_dongusu_hatada_durmaz(veritabani, saat, monkeypatch):
+    monkeypatch.setattr(hatirlatici, 'HATA_BEKLEMESI_MIN', 0.01)
+    zamanlayici = _zamanlayici(veritabani, saat)
+    hatalar = []
+    basarili = threading.Event()
+    asil_isle = zamanlayici.isle
+
+    def isle():
+        if len(hatalar) < 2:
+            hatalar.append(1)
+            raise sqlite3.OperationalError("database is locked")
+        sonuc = asil_isle()
+        basarili.set()
+        return sonuc
+
+    zamanlayici.isle = isle
+    zamanlayici.baslat()
+    assert basarili.wait(timeout=5)
+    zamanlayici.durdur()
+    assert len(hatalar) == 2
+
+
+def test_baska_veritabanindaki_degisiklik_yok_sayilir(veritabani, saat, tmp_path):
+    randevu.add_appointment('Ali', '19-10-2026', '10:30')
+    zamanlayici = _zamanlayici(veritabani, saat)
+    zamanlayici.isle()
+
+    # app.py'nin veritabanında aynı id'ye sahip bir randevu silinmiş gibi bildir
+    randevu.notify_change(str(tmp_path / 'kuafor.db'), 'delete', 1,
+                          {'id': 1, 'tarih': '2026-10-19', 'saat': '10:30'}, None)
+    randevu.notify_change(str(tmp_path / 'kuafor.db'), 'insert', 2,
+                          None, {'id': 2, 'randevu_tarihi': '2026-10-19', 'randevu_saati': '09:15'})
+
+    saat[0] = datetime(2026, 10, 19, 9, 30)
+    assert zamanlayici.isle() == 1
+    assert _gonderilen_idler(zamanlayici) == [1]
+
+
+def test_gonderilemeyen_hatirlatma_tekrar_denenir(veritabani, saat, tmp_path):
+    dosya = str(tmp_path / 'gonderilenler.json')
+    randevu.add_appointment('Ali', '19-10-2026', '10:30')
+    zamanlayici = hatirlatici.HatirlaticiZamanlayici(BozukGonderici(1), veritabani, saat=lambda: saat[0],
+                                                     gonderilenler_dosyasi=dosya)
+    randevu.add_change_listener(zamanlayici.randevu_degisti)
+
+    saat[0] = datetime(2026, 10, 19, 9, 30)
+    assert zamanlayici.isle() == 0
+    assert not os.path.exists(dosya)
+    assert zamanlayici.siradaki_zaman() == saat[0] + hatirlatici.GONDERIM_TEKRAR_SURESI
+
+    saat[0] = zamanlayici.siradaki_zaman()
+    assert zamanlayici.isle() == 1
+    assert _gonderilen_idler(zamanlayici) == [1]
+    with open(dosya) as f:
+        assert json.load(f) == {'1': '2026-10-19 10:30'}
+
+
+def test_veritabani_okunamazsa_hatirlatma_kaybolmaz(veritabani, saat):
+    randevu.add_appointment('Ali', '19-10-2026', '10:30')
+    zamanlayici = _zamanlayici(veritabani, saat)
+    zamanlayici.isle()
+
+    def kilitli(ids):
+        raise sqlite3.OperationalError("database is locked")
+
+    saat[0] = datetime(2026, 10, 19, 9, 30)
+    zamanlayici._satirlari_getir = kilitli
+    with pytest.raises(sqlite3.OperationalError):
+        zamanlayici.isle()
+    del zamanlayici._satirlari_getir
+
+    assert zamanlayici.isle() == 1
+    assert _gonderilen_idler(zamanlayici) == [1]
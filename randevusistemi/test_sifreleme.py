@@ -0,0 +1,124 @@
+import pytest
+
+import app
+import sifreleme
+
+HIZLI_SCRYPT = {'algoritma': 'scrypt', 'n': 2 ** 4, 'r': 8, 'p': 1}
+HIZLI_PBKDF2 = {'algoritma': 'pbkdf2_sha256', 'iterasyon': 1000}
+
+
+@pytest.fixture(autouse=True)
+def hizli_parametreler(monkeypatch):
+    monkeypatch.setattr(sifreleme, 'SIFRE_PARAMETRELERI', HIZLI_SCRYPT)
+
+
+@pytest.fixture
+def veritabani(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, 'DATABASE_NAME', str(tmp_path / 'kuafor.db'))
+    app.create_tables()
+
+
+def _saklanan_sifre(kullanici_adi):
+    conn, cursor = app.connect_db()
+    cursor.execute('SELECT sifre FROM musteriler WHERE kullanici_adi = ?', (kullanici_adi,))
+    sifre = cursor.fetchone()['sifre']
+    conn.close()
+    return sifre
+
+
+@pytest.mark.parametrize('parametreler', [HIZLI_SCRYPT, HIZLI_PBKDF2])
+def test_hash_dogrulama(parametreler):
+    saklanan = sifreleme.sifre_hashle('gizli', parametreler)
+    assert 'gizli' not in saklanan
+    assert sifreleme.sifre_dogrula('gizli', saklanan)
+    assert not sifreleme.sifre_dogrula('yanlis', saklanan)
+    assert not sifreleme.yeniden_hash_gerekli_mi(saklanan, parametreler)
+
+
+def test_ayni_sifre_farkli_tuz():
+    assert sifreleme.sifre_hashle('gizli') != sifreleme.sifre_hashle('gizli')
+
+
+def test_ayar_degisince_yeniden_hash():
+    saklanan = sifreleme.sifre_hashle('gizli', HIZLI_PBKDF2)
+    assert sifreleme.yeniden_hash_gerekli_mi(saklanan)
+    assert sifreleme.dogrula_ve_guncelle('yanlis', saklanan) == (False, None)
+
+    dogru_mu, yeni_hash = sifreleme.dogrula_ve_guncelle('gizli', saklanan)
+    assert dogru_mu
+    assert yeni_hash.startswith('scrypt$16$')
+    assert sifreleme.sifre_dogrula('gizli', yeni_hash)
+
+
+def test_duz_metin_kayit():
+    assert sifreleme.sifre_dogrula('gizli', 'gizli')
+    assert not sifreleme.sifre_dogrula('yanlis', 'gizli')
+    assert sifreleme.yeniden_hash_gerekli_mi('gizli')
+
+
+@pytest.mark.parametrize('bozuk', [
+    'scrypt$1000$8$1$00ff$00ff',
+    'scrypt$16$0$1$00ff$00ff',
+    'scrypt$16$8$1$zz$00ff',
+    'scrypt$16$8$1$00ff',
+    'pbkdf2_sha256$0$00ff$00ff',
+])
+def test_bozuk_hash_dogrulanmaz(bozuk):
+    assert not sifreleme.sifre_dogrula(bozuk, bozuk)
+    assert sifreleme.dogrula_ve_guncelle('gizli', bozuk) == (False, None)
+
+
+def test_havuzda_dogrulama():
+    saklanan = sifreleme.sifre_hashle('gizli')
+    with sifreleme.DogrulamaHavuzu(isci_sayisi=2) as havuz:
+        assert havuz.dogrula('gizli', saklanan).result() == (True, None)
+        assert havuz.dogrula('yanlis', saklanan).result() == (False, None)
+
+
+def test_musteri_ekle_hashli_saklar(veritabani):
+    app.musteri_ekle('ayse', 'gizli')
+    saklanan = _saklanan_sifre('ayse')
+    assert saklanan != 'gizli'
+    assert sifreleme.sifre_dogrula('gizli', saklanan)
+
+
+def test_musteri_giris(veritabani):
+    app.musteri_ekle('ayse', 'gizli')
+    assert app.musteri_giris('ayse', 'gizli') == 1
+    assert app.musteri_giris('ayse', 'yanlis') is None
+    assert app.musteri_giris('olmayan', 'gizli') is None
+    assert app.musteri_giris_async('ayse', 'gizli').result() == 1
+
+
+def test_giriste_yeniden_hash(veritabani, monkeypatch):
+    monkeypatch.setattr(sifreleme, 'SIFRE_PARAMETRELERI', HIZLI_PBKDF2)
+    app.musteri_ekle('ayse', 'gizli')
+    assert _saklanan_sifre('ayse').startswith('pbkdf2_sha256$')
+
+    monkeypatch.setattr(sifreleme, 'SIFRE_PARAMETRELERI', HIZLI_SCRYPT)
+    assert app.musteri_giris('ayse', 'yanlis') is None
+    assert _saklanan_sifre('ayse').startswith('pbkdf2_sha256$')
+    assert app.musteri_giris('ayse', 'gizli') == 1
+    assert _saklanan_sifre('ayse').startswith('scrypt$')
+    assert app.musteri_giris('ayse', 'gizli') == 1
+
+
+def test_bozuk_hash_ile_giris_basarisiz(veritabani):
+    conn, cursor = app.connect_db()
+    cursor.execute("INSERT INTO musteriler (kullanici_adi, sifre) VALUES ('bozuk', 'scrypt$1000$8$1$00ff$00ff')")
+    conn.commit()
+    conn.close()
+
+    assert app.musteri_giris('bozuk', 'gizli') is None
+    assert app.musteri_giris('bozuk', 'scrypt$1000$8$1$00ff$00ff') is None
+
+
+def test_duz_metin_kayit_giriste_hashlenir(veritabani):
+    conn, cursor = app.connect_db()
+    cursor.execute("INSERT INTO musteriler (kullanici_adi, sifre) VALUES ('eski', 'gizli')")
+    conn.commit()
+    conn.close()
+
+    assert app.musteri_giris('eski', 'gizli') == 1
+    assert sifreleme.sifre_dogrula('gizli', _saklanan_sifre('eski'))
+    assert _saklanan_sifre('eski').startswith('scrypt$')